@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark pentru postprocesare pe segmentari sintetice zgomotoase
+
+Rulare (din directorul Backend):
+    python -m benchmarks.postprocess_benchmark
+    python -m benchmarks.postprocess_benchmark --size 128 --noise 0.002 --repeats 3
+    python -m benchmarks.postprocess_benchmark --workers 4
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from scipy.ndimage import binary_fill_holes, binary_opening, label
+
+from src.services.postprocess import GliomaPostprocessor
+
+
+def make_noisy_segmentation(size: int = 128, noise: float = 0.002, seed: int = 0) -> np.ndarray:
+    """
+    Creeaza o segmentare sintetica: cate o sfera pentru fiecare clasa
+    plus voxeli izolati (zgomot) care formeaza sute de componente mici
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.indices((size, size, size), dtype=np.float32)
+    segmentation = np.zeros((size, size, size), dtype=np.int64)
+
+    for class_id in range(1, 5):
+        center = rng.uniform(0.25, 0.75, size=3) * size
+        radius = rng.uniform(0.06, 0.15) * size
+        dist2 = sum((grid[axis] - center[axis]) ** 2 for axis in range(3))
+        segmentation[dist2 < radius ** 2] = class_id
+
+    # Zgomot: voxeli si mici clustere cu clase aleatoare
+    noise_mask = rng.random(segmentation.shape) < noise
+    segmentation[noise_mask] = rng.integers(1, 5, size=int(noise_mask.sum()))
+
+    return segmentation
+
+
+def remove_small_components_legacy(processor: GliomaPostprocessor, segmentation: np.ndarray) -> np.ndarray:
+    """Implementarea anterioara: o masca pe tot volumul pentru fiecare componenta"""
+    filtered = segmentation.copy()
+
+    for class_id in range(1, 5):
+        if class_id not in segmentation:
+            continue
+
+        class_mask = (filtered == class_id)
+        if class_mask.sum() == 0:
+            continue
+
+        labeled_array, num_components = label(class_mask)
+        min_size = processor.min_component_sizes.get(class_id, 50)
+
+        for comp_id in range(1, num_components + 1):
+            component_mask = (labeled_array == comp_id)
+            if component_mask.sum() < min_size:
+                filtered[component_mask] = 0
+
+    return filtered
+
+
+def apply_morphological_cleaning_legacy(segmentation: np.ndarray) -> np.ndarray:
+    """Implementarea anterioara: opening + fill holes pe tot volumul pentru fiecare clasa"""
+    cleaned = segmentation.copy()
+
+    for class_id in range(1, 5):
+        if class_id not in segmentation:
+            continue
+
+        class_mask = (cleaned == class_id)
+        if class_mask.sum() == 0:
+            continue
+
+        iterations = 1 if class_id in [1, 3, 4] else 2
+        opened_mask = binary_opening(class_mask, iterations=iterations)
+        filled_mask = binary_fill_holes(opened_mask)
+
+        cleaned[class_mask] = 0
+        cleaned[filled_mask] = class_id
+
+    return cleaned
+
+
+def time_function(func: Callable, segmentation: np.ndarray, repeats: int) -> Dict:
+    """Masoara timpul de executie (cel mai bun din `repeats` rulari)"""
+    timings: List[float] = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(segmentation)
+        timings.append(time.perf_counter() - start)
+    return {"best": min(timings), "mean": sum(timings) / len(timings), "result": result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark postprocesare segmentare")
+    parser.add_argument("--size", type=int, default=128, help="Latura volumului (voxeli)")
+    parser.add_argument("--noise", type=float, default=0.002, help="Fractia de voxeli zgomot")
+    parser.add_argument("--repeats", type=int, default=3, help="Numarul de repetari")
+    parser.add_argument("--workers", type=int, default=4, help="Thread-uri pentru modul paralel")
+    args = parser.parse_args()
+
+    processor = GliomaPostprocessor()
+    segmentation = make_noisy_segmentation(args.size, args.noise)
+
+    components = {
+        class_id: label(segmentation == class_id)[1] for class_id in range(1, 5)
+    }
+    print(f"[BENCHMARK] Volum {segmentation.shape}, zgomot={args.noise}")
+    print(f"[BENCHMARK] Componente per clasa: {components}")
+
+    legacy = time_function(lambda seg: remove_small_components_legacy(processor, seg),
+                           segmentation, args.repeats)
+    current = time_function(processor.remove_small_components, segmentation, args.repeats)
+
+    report("remove_small_components", legacy, current)
+
+    # Morfologia pe segmentarea deja filtrata (fara zgomot, ca in pipeline)
+    filtered = current["result"]
+    legacy = time_function(apply_morphological_cleaning_legacy, filtered, args.repeats)
+    current = time_function(processor.apply_morphological_cleaning, filtered, args.repeats)
+
+    report("apply_morphological_cleaning", legacy, current)
+
+    # Modul paralel pe clase (thread pool) fata de cel secvential
+    parallel_processor = GliomaPostprocessor(num_workers=args.workers)
+    for name in ["remove_small_components", "apply_morphological_cleaning"]:
+        source = segmentation if name == "remove_small_components" else filtered
+        sequential = time_function(getattr(processor, name), source, args.repeats)
+        parallel = time_function(getattr(parallel_processor, name), source, args.repeats)
+        report(name, sequential, parallel, labels=("secvential", f"{args.workers} thread-uri"))
+
+
+def report(name: str, legacy: Dict, current: Dict, labels: tuple = ("legacy", "curent")) -> None:
+    """Afiseaza comparatia dintre implementarea de referinta si cea curenta"""
+    identical = np.array_equal(legacy["result"], current["result"])
+
+    print(f"[BENCHMARK] {name} ({labels[0]}):  {legacy['best'] * 1000:.1f} ms")
+    print(f"[BENCHMARK] {name} ({labels[1]}):  {current['best'] * 1000:.1f} ms")
+    print(f"[BENCHMARK] Speedup: {legacy['best'] / current['best']:.1f}x | Rezultat identic: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,12 @@ except ImportError:
     ML_CLEANUP_AVAILABLE = False
     force_global_cleanup = None
 
+# Import prefetch pentru oprire la shutdown
+try:
+    from src.services.prefetch import shutdown_prefetcher
+except ImportError:
+    shutdown_prefetcher = None
+
 # Configurare encoding pentru Windows
 if sys.platform.startswith('win'):
     if hasattr(sys.stdout, 'reconfigure'):
@@ -43,6 +49,13 @@ def cleanup_resources():
     """Functie de cleanup la inchiderea aplicatiei"""
     print("\n[SHUTDOWN] Cleanup resurse la inchiderea aplicatiei...")
 
+    if shutdown_prefetcher:
+        try:
+            shutdown_prefetcher()
+            print("[SHUTDOWN] Prefetch preprocesare oprit")
+        except Exception as e:
+            print(f"[SHUTDOWN] Eroare la oprirea prefetch-ului: {str(e)}")
+
     if ML_CLEANUP_AVAILABLE and force_global_cleanup:
         try:
             force_global_cleanup()
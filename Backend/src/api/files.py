@@ -7,9 +7,18 @@ from fastapi.responses import JSONResponse, FileResponse
 import mimetypes
 from pathlib import Path
 
-from src.core.config import UPLOAD_DIR, get_file_size_mb
+from src.core.config import UPLOAD_DIR, PREFETCH_PREPROCESSING, get_file_size_mb
 from src.utils.file_utils import validate_file, save_file, list_files, delete_file
 
+# Import prefetch preprocesare (optional)
+try:
+    from src.services.prefetch import get_prefetcher
+
+    PREFETCH_AVAILABLE = True
+except ImportError as e:
+    print(f"[WARNING] Prefetch-ul de preprocesare nu este disponibil: {e}")
+    PREFETCH_AVAILABLE = False
+
 router = APIRouter(prefix="/files", tags=["Files"])
 
 
@@ -73,6 +82,18 @@ async def upload_mri_file(file: UploadFile = File(...)):
             print(f"[INFO] Extras in folderul: {file_info['extraction']['extracted_folder']}")
             print(f"[INFO] Fisiere NIfTI gasite: {file_info['extraction']['nifti_files_count']}")
 
+            # Porneste preprocesarea speculativa pentru folderele valide (opt-in)
+            extraction = file_info["extraction"]
+            file_info["preprocessing_prefetched"] = False
+            if (PREFETCH_PREPROCESSING and PREFETCH_AVAILABLE and
+                    extraction["segmentation_validation"]["is_valid_for_segmentation"]):
+                try:
+                    file_info["preprocessing_prefetched"] = get_prefetcher().schedule(
+                        UPLOAD_DIR / extraction["extracted_folder"]
+                    )
+                except Exception as e:
+                    print(f"[WARNING] Nu s-a putut programa prefetch-ul: {str(e)}")
+
             return JSONResponse(
                 status_code=200,
                 content={
@@ -148,6 +169,10 @@ async def delete_uploaded_file(filename: str):
     try:
         result = delete_file(filename)
 
+        # Anuleaza preprocesarea speculativa pentru folderul afectat
+        if PREFETCH_AVAILABLE:
+            get_prefetcher().cancel(Path(filename).parts[0])
+
         if result["type"] == "file":
             print(f"[SUCCESS] Fisier sters: {filename} ({result['size_mb']})")
             message = f"Fisierul {filename} a fost sters cu succes"
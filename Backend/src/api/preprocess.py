@@ -6,11 +6,11 @@ from fastapi import APIRouter, HTTPException
 import base64
 import io
 
-from src.core.config import UPLOAD_DIR, TEMP_PREPROCESSING_DIR, get_file_size_mb
+from src.core.config import UPLOAD_DIR, TEMP_PREPROCESSING_DIR, PREFETCH_PREPROCESSING, get_file_size_mb
 
 # Import services pentru preprocesare
 try:
-    from src.services import get_preprocessor, preprocess_folder_simple
+    from src.services import get_preprocessor, preprocess_folder_simple, get_prefetcher
     from src.utils.nifti_validation import find_valid_segmentation_folders
 
     SERVICE_AVAILABLE = True
@@ -61,6 +61,23 @@ async def get_preprocess_status():
         }
 
 
+@router.get("/prefetch")
+async def get_prefetch_status():
+    """
+    Verifica starea preprocesarii speculative (prefetch dupa upload)
+    """
+    if not SERVICE_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Sistemul de preprocesare nu este disponibil"
+        )
+
+    return {
+        "prefetch_enabled": PREFETCH_PREPROCESSING,
+        **get_prefetcher().get_status()
+    }
+
+
 @router.get("/folders")
 async def get_valid_folders():
     """
@@ -35,6 +35,12 @@ TEMP_PROCESSING_DIR = Path("temp/processing")
 TEMP_PREPROCESSING_DIR = Path("temp/preprocess")
 TEMP_RESULTS_DIR = Path("temp/results")
 
+# Configurări prefetch preprocesare (opt-in)
+# Pornește preprocesarea în background imediat după upload-ul unui folder valid
+PREFETCH_PREPROCESSING = os.getenv("PREFETCH_PREPROCESSING", "false").lower() == "true"
+PREFETCH_MAX_WORKERS = int(os.getenv("PREFETCH_MAX_WORKERS", "1"))
+PREFETCH_MAX_ENTRIES = int(os.getenv("PREFETCH_MAX_ENTRIES", "2"))  # Rezultate ținute în memorie
+
 # Parametrii model MedNeXt
 NUM_CHANNELS = 4        # 4 modalități (T1, T1c, T2, FLAIR)
 NUM_CLASSES = 5         # 5 clase (background + 4 tipuri de segmentare)
@@ -48,6 +54,12 @@ IMG_SIZE = (128, 128, 128)  # Dimensiunea finală pentru model
 SPACING = (1.0, 1.0, 1.0)   # Voxel spacing standard
 ORIENTATION = "RAI"          # Right, Anterior, Inferior
 
+# Parametrii postprocesare
+# Numărul de thread-uri pentru procesarea paralelă pe clase (1 = secvențial)
+POSTPROCESS_WORKERS = int(os.getenv("POSTPROCESS_WORKERS", "1"))
+# Cache pe disc pentru kernel-urile numba compilate (JIT-ul se plătește o singură dată)
+NUMBA_CACHE_DIR = Path(os.getenv("NUMBA_CACHE_DIR", "temp/numba_cache"))
+
 # Parametrii normalizare intensitate (pentru fiecare modalitate)
 INTENSITY_RANGES = {
     "t1n": {"a_min": 0, "a_max": 3000, "b_min": 0.0, "b_max": 1.0},
@@ -11,6 +11,7 @@ from .inference import (
     run_inference_on_preprocessed, get_inference_service,
     check_existing_result, get_existing_result_info
 )
+from .prefetch import PreprocessPrefetcher, get_prefetcher, shutdown_prefetcher
 
 __all__ = [
     # Preprocess
@@ -31,5 +32,10 @@ __all__ = [
     'run_inference_on_preprocessed',
     'get_inference_service',
     'check_existing_result',
-    'get_existing_result_info'
+    'get_existing_result_info',
+
+    # Prefetch preprocesare
+    'PreprocessPrefetcher',
+    'get_prefetcher',
+    'shutdown_prefetcher'
 ]
\ No newline at end of file
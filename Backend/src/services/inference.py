@@ -12,6 +12,7 @@ import nibabel as nib
 
 from .preprocess import get_preprocessor
 from .postprocess import get_postprocessor
+from .prefetch import get_prefetcher
 
 try:
     from src.ml import get_model_wrapper, ensure_model_loaded
@@ -223,7 +224,11 @@ class GliomaInferenceService:
             # 1. PREPROCESS
             print("[INFERENCE] Etapa 1: Preprocesare...")
             preprocess_start = time.time()
-            preprocessed_data = self.preprocessor.preprocess_folder(folder_path)
+
+            # Foloseste preprocesarea speculativa daca a fost programata la upload
+            preprocessed_data = get_prefetcher().take(folder_path)
+            if preprocessed_data is None:
+                preprocessed_data = self.preprocessor.preprocess_folder(folder_path)
             preprocess_time = time.time() - preprocess_start
 
             image_tensor = preprocessed_data["image_tensor"]
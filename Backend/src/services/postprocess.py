@@ -5,7 +5,8 @@ Postprocesare MONAI pentru segmentare gliome - cu overlay support FIXED
 import torch
 import numpy as np
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 import nibabel as nib
 
 try:
@@ -15,16 +16,26 @@ try:
 except ImportError:
     MONAI_AVAILABLE = False
 
-from scipy.ndimage import binary_fill_holes, binary_opening, label
+from scipy.ndimage import binary_fill_holes, binary_opening, find_objects, label
+
+from src.core.config import POSTPROCESS_WORKERS
+from src.utils.label_kernels import argmax_to_uint8, count_labels, remap_labels
 
 
 class GliomaPostprocessor:
     """Postprocesare pentru segmentarea gliomelor post-tratament cu suport overlay FIXED"""
 
-    def __init__(self):
+    def __init__(self, num_workers: int = POSTPROCESS_WORKERS):
         if not MONAI_AVAILABLE:
             raise ImportError("MONAI necesar pentru postprocesare")
 
+        # Mod paralel: clasele 1-4 sunt procesate concurent (scipy.ndimage elibereaza GIL-ul)
+        self.num_workers = max(1, num_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Ordinea de prioritate la combinarea claselor - ultima clasa scrisa castiga
+        self.class_priority = [1, 2, 3, 4]
+
         self.min_component_sizes = {
             1: 50,  # NETC
             2: 100,  # SNFH
@@ -55,50 +66,149 @@ class GliomaPostprocessor:
 
         return classes
 
+    @property
+    def parallel(self) -> bool:
+        """True daca postprocesarea ruleaza pe mai multe thread-uri"""
+        return self.num_workers > 1
+
+    def _map_classes(self, func: Callable, class_ids: List[int]) -> List:
+        """Aplica func pe fiecare clasa - concurent in modul paralel, altfel secvential"""
+        if not self.parallel or len(class_ids) < 2:
+            return [func(class_id) for class_id in class_ids]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_workers,
+                                                thread_name_prefix="postprocess")
+        return list(self._executor.map(func, class_ids))
+
+    def get_morphology_iterations(self, class_id: int) -> int:
+        """Numarul de iteratii pentru binary_opening pe clasa data"""
+        return 1 if class_id in [1, 3, 4] else 2
+
+    def get_class_bounding_boxes(self, segmentation: np.ndarray,
+                                 margins: Optional[Dict[int, int]] = None) -> Dict[int, Tuple[slice, ...]]:
+        """
+        Calculeaza bounding box-ul fiecarei clase (1-4) intr-o singura trecere,
+        extins cu marginea data si limitat la dimensiunile volumului
+        """
+        boxes = {}
+        for class_id, box in enumerate(find_objects(segmentation, max_label=4), start=1):
+            if box is None:
+                continue
+
+            margin = margins.get(class_id, 0) if margins else 0
+            boxes[class_id] = tuple(
+                slice(max(axis_slice.start - margin, 0), min(axis_slice.stop + margin, dim))
+                for axis_slice, dim in zip(box, segmentation.shape)
+            )
+
+        return boxes
+
     def apply_morphological_cleaning(self, segmentation: np.ndarray) -> np.ndarray:
-        """Aplica operatii morfologice pentru curatare"""
+        """
+        Aplica operatii morfologice pentru curatare
+
+        Operatiile ruleaza doar in bounding box-ul fiecarei clase, extins cu raza
+        elementului structurant (+1 pentru fill holes), iar rezultatul este scris
+        inapoi prin view - identic bit cu bit cu varianta pe tot volumul
+        """
         cleaned = segmentation.copy()
 
+        # Bounding box-urile din segmentarea initiala acopera si masca curenta a clasei,
+        # deoarece clasele anterioare pot doar sa suprascrie voxeli, nu sa adauge
+        margins = {class_id: self.get_morphology_iterations(class_id) + 1 for class_id in range(1, 5)}
+        boxes = self.get_class_bounding_boxes(segmentation, margins)
+
+        if self.parallel:
+            return self._apply_morphological_cleaning_parallel(segmentation, cleaned, boxes)
+
         for class_id in range(1, 5):
-            if class_id not in segmentation:
+            if class_id not in boxes:
                 continue
 
-            class_mask = (cleaned == class_id)
-            if class_mask.sum() == 0:
+            sub_volume = cleaned[boxes[class_id]]  # view in `cleaned`
+            class_mask = (sub_volume == class_id)
+            if not class_mask.any():
                 continue
 
             # Binary opening + fill holes
-            iterations = 1 if class_id in [1, 3, 4] else 2
+            iterations = self.get_morphology_iterations(class_id)
             opened_mask = binary_opening(class_mask, iterations=iterations)
             filled_mask = binary_fill_holes(opened_mask)
 
-            cleaned[class_mask] = 0
-            cleaned[filled_mask] = class_id
+            sub_volume[class_mask] = 0
+            sub_volume[filled_mask] = class_id
 
         return cleaned
 
-    def remove_small_components(self, segmentation: np.ndarray) -> np.ndarray:
-        """Elimina componentele conexe mici"""
-        filtered = segmentation.copy()
+    def _apply_morphological_cleaning_parallel(self, segmentation: np.ndarray, cleaned: np.ndarray,
+                                               boxes: Dict[int, Tuple[slice, ...]]) -> np.ndarray:
+        """
+        Varianta paralela: mastile claselor sunt calculate concurent din segmentarea
+        initiala, apoi combinate in ordinea self.class_priority
 
-        for class_id in range(1, 5):
-            if class_id not in segmentation:
-                continue
+        Difera de varianta secventiala doar cand fill holes al unei clase acopera
+        voxeli ai unei clase procesate ulterior (acolo secventialul foloseste masca deja modificata)
+        """
+        def clean_class(class_id: int) -> Tuple[int, Optional[np.ndarray]]:
+            class_mask = (segmentation[boxes[class_id]] == class_id)
+            if not class_mask.any():
+                return class_id, None
+
+            iterations = self.get_morphology_iterations(class_id)
+            return class_id, binary_fill_holes(binary_opening(class_mask, iterations=iterations))
+
+        filled_masks = dict(self._map_classes(clean_class, [c for c in self.class_priority if c in boxes]))
 
-            class_mask = (filtered == class_id)
-            if class_mask.sum() == 0:
+        for class_id in self.class_priority:
+            filled_mask = filled_masks.get(class_id)
+            if filled_mask is None:
                 continue
 
-            labeled_array, num_components = label(class_mask)
-            min_size = self.min_component_sizes.get(class_id, 50)
+            sub_volume = cleaned[boxes[class_id]]
+            sub_volume[sub_volume == class_id] = 0
+            sub_volume[filled_mask] = class_id
+
+        return cleaned
+
+    def remove_small_components(self, segmentation: np.ndarray) -> np.ndarray:
+        """
+        Elimina componentele conexe mici
+
+        Pentru fiecare clasa: o singura etichetare, dimensiunile tuturor componentelor
+        dintr-o singura histograma (bincount) si eliminarea celor prea mici
+        printr-un singur pas de lookup table peste volumul etichetat.
+        Clasele sunt independente, deci modul paralel da acelasi rezultat.
+        """
+        filtered = segmentation.copy()
+        class_counts = count_labels(segmentation, 5)
+        class_ids = [class_id for class_id in range(1, 5) if class_counts[class_id] > 0]
 
-            for comp_id in range(1, num_components + 1):
-                component_mask = (labeled_array == comp_id)
-                if component_mask.sum() < min_size:
-                    filtered[component_mask] = 0
+        for remove_mask in self._map_classes(
+                lambda class_id: self._small_components_mask(segmentation, class_id), class_ids):
+            if remove_mask is not None:
+                filtered[remove_mask] = 0
 
         return filtered
 
+    def _small_components_mask(self, segmentation: np.ndarray, class_id: int) -> Optional[np.ndarray]:
+        """Masca voxelilor din componentele clasei mai mici decat pragul (None daca nu exista)"""
+        labeled_array, num_components = label(segmentation == class_id)
+        if num_components == 0:
+            return None
+
+        min_size = self.min_component_sizes.get(class_id, 50)
+
+        # Dimensiunea fiecarei componente (index 0 = fundal)
+        component_sizes = np.bincount(labeled_array.ravel(), minlength=num_components + 1)
+        remove_lut = component_sizes < min_size
+        remove_lut[0] = False
+
+        if not remove_lut.any():
+            return None
+
+        return remap_labels(labeled_array, remove_lut)
+
     def normalize_t1n_for_overlay(self, t1n_data: np.ndarray) -> np.ndarray:
         """
         Normalizează datele T1N pentru overlay păstrând aspectul original (nu grayscale)
@@ -178,22 +288,35 @@ class GliomaPostprocessor:
         print(f"[OVERLAY] Overlay transparent creat: {overlay_image.shape}")
         return overlay_image
 
+    def predictions_to_segmentation(self, predictions: torch.Tensor) -> np.ndarray:
+        """
+        Converteste predictiile direct in segmentare uint8 (H, W, D)
+
+        Softmax-ul nu schimba argmax-ul, deci se aplica argmax direct pe logits
+        """
+        if isinstance(predictions, torch.Tensor):
+            predictions = predictions.detach().float().cpu().numpy()
+
+        if predictions.ndim == 5:  # (1, C, H, W, D)
+            predictions = predictions[0]
+
+        return argmax_to_uint8(predictions)
+
     def postprocess_segmentation(self, predictions: torch.Tensor) -> Tuple[np.ndarray, Dict]:
         """Pipeline complet de postprocesare"""
         # Converteste in clase
-        classes = self.convert_predictions_to_classes(predictions)
-        segmentation = classes.cpu().numpy() if isinstance(classes, torch.Tensor) else classes
+        segmentation = self.predictions_to_segmentation(predictions)
 
         # Aplica postprocesare
         segmentation = self.apply_morphological_cleaning(segmentation)
         segmentation = self.remove_small_components(segmentation)
 
-        # Statistici - converteste toate valorile numpy in tipuri Python
-        unique_classes, counts = np.unique(segmentation, return_counts=True)
-        class_stats = {int(cls): int(count) for cls, count in zip(unique_classes, counts)}
+        # Statistici - o singura trecere peste volum, valori convertite in tipuri Python
+        counts = count_labels(segmentation, 5)
+        class_stats = {int(cls): int(count) for cls, count in enumerate(counts) if count > 0}
 
         stats = {
-            "classes_found": [int(cls) for cls in unique_classes],
+            "classes_found": list(class_stats.keys()),
             "class_counts": class_stats,
             "total_segmented_voxels": int(sum(count for cls, count in class_stats.items() if cls > 0)),
             "segmentation_shape": [int(dim) for dim in segmentation.shape]
@@ -274,9 +397,9 @@ class GliomaPostprocessor:
 
 
 # Functii utilitare
-def create_postprocessor() -> GliomaPostprocessor:
-    """Creeaza instanta postprocessor"""
-    return GliomaPostprocessor()
+def create_postprocessor(num_workers: int = POSTPROCESS_WORKERS) -> GliomaPostprocessor:
+    """Creeaza instanta postprocessor (num_workers > 1 activeaza modul paralel)"""
+    return GliomaPostprocessor(num_workers=num_workers)
 
 
 def quick_postprocess(predictions: torch.Tensor, folder_name: str, output_base_dir: Path = None) -> Tuple[
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Prefetch pentru preprocesare - porneste preprocesarea in background imediat dupa
+upload-ul unui folder valid, astfel incat inferenta sa treaca direct la model
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+from src.core.config import PREFETCH_MAX_WORKERS, PREFETCH_MAX_ENTRIES, TEMP_PREPROCESSING_DIR
+from .preprocess import get_preprocessor
+
+
+def get_folder_signature(folder_path: Path) -> tuple:
+    """
+    Calculeaza semnatura unui folder (nume, dimensiune, mtime pentru fisierele NIfTI)
+    Folosita pentru a detecta daca folderul s-a modificat dupa programarea prefetch-ului
+    """
+    signature = []
+    for file_path in sorted(folder_path.glob("*.nii*")):
+        if file_path.is_file():
+            stat = file_path.stat()
+            signature.append((file_path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class PreprocessPrefetcher:
+    """Programeaza preprocesarea speculativa si pastreaza rezultatele pana la inferenta"""
+
+    def __init__(self, max_workers: int = PREFETCH_MAX_WORKERS,
+                 max_entries: int = PREFETCH_MAX_ENTRIES,
+                 cache_dir: Path = TEMP_PREPROCESSING_DIR):
+        self.max_workers = max(1, max_workers)
+        self.max_entries = max(1, max_entries)
+        self.cache_dir = cache_dir
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # folder_name -> {"future", "signature", "cancelled", "cache_path"}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        self.stats = {"scheduled": 0, "completed": 0, "failed": 0, "cancelled": 0, "hits": 0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="prefetch")
+        return self._executor
+
+    def schedule(self, folder_path: Path) -> bool:
+        """
+        Programeaza preprocesarea pentru un folder valid
+
+        Returns:
+            True daca preprocesarea a fost programata (sau exista deja pentru aceeasi versiune)
+        """
+        folder_name = folder_path.name
+        signature = get_folder_signature(folder_path)
+
+        with self._lock:
+            existing = self._entries.get(folder_name)
+            if existing and existing["signature"] == signature and not existing["cancelled"]:
+                return True
+
+            if existing:
+                self._cancel_entry(folder_name, existing)
+
+            entry = {
+                "signature": signature,
+                "cancelled": False,
+                "cache_path": self.cache_dir / f"{folder_name}_preprocessed.pt",
+                "future": None
+            }
+            entry["future"] = self._get_executor().submit(self._run, folder_path, entry)
+            self._entries[folder_name] = entry
+            self._entries.move_to_end(folder_name)
+            self.stats["scheduled"] += 1
+            self._evict_completed()
+
+        print(f"[PREFETCH] Preprocesare programata pentru: {folder_name}")
+        return True
+
+    def _run(self, folder_path: Path, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Ruleaza preprocesarea in thread-ul de background"""
+        if entry["cancelled"]:
+            return None
+
+        try:
+            preprocessor = get_preprocessor()
+            preprocessed_data = preprocessor.preprocess_folder(folder_path)
+
+            if entry["cancelled"]:
+                return None
+
+            # Salveaza si in cache-ul de preprocesare de pe disc
+            preprocessor.save_preprocessed_data(preprocessed_data, entry["cache_path"])
+
+            with self._lock:
+                # Folderul a fost sters cat timp rula preprocesarea
+                if entry["cancelled"]:
+                    entry["cache_path"].unlink(missing_ok=True)
+                    return None
+                self.stats["completed"] += 1
+
+            print(f"[PREFETCH] Preprocesare completa pentru: {folder_path.name}")
+            return preprocessed_data
+
+        except Exception as e:
+            self.stats["failed"] += 1
+            print(f"[PREFETCH ERROR] Preprocesarea speculativa a esuat pentru {folder_path.name}: {str(e)}")
+            return None
+
+    def take(self, folder_path: Path, wait: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Returneaza (si elibereaza) rezultatul preprocesarii pentru un folder
+
+        Args:
+            folder_path: Folderul pentru care se cere rezultatul
+            wait: Daca sa astepte un prefetch aflat inca in executie
+
+        Returns:
+            Datele preprocesate sau None daca nu exista un prefetch valid
+        """
+        folder_name = folder_path.name
+
+        with self._lock:
+            entry = self._entries.get(folder_name)
+            if entry is None or entry["cancelled"]:
+                return None
+            future: Future = entry["future"]
+
+        if not wait and not future.done():
+            return None
+
+        try:
+            preprocessed_data = future.result()
+        except Exception:
+            preprocessed_data = None
+
+        with self._lock:
+            if self._entries.get(folder_name) is entry:
+                del self._entries[folder_name]
+
+        if preprocessed_data is None or entry["cancelled"]:
+            return None
+
+        # Folderul s-a modificat dupa programare - rezultatul nu mai e valid
+        if get_folder_signature(folder_path) != entry["signature"]:
+            print(f"[PREFETCH] Folderul {folder_name} s-a modificat, ignor prefetch-ul")
+            return None
+
+        self.stats["hits"] += 1
+        print(f"[PREFETCH] Folosesc preprocesarea speculativa pentru: {folder_name}")
+        return preprocessed_data
+
+    def cancel(self, folder_name: str) -> bool:
+        """
+        Anuleaza prefetch-ul pentru un folder (ex: cand folderul este sters)
+
+        Returns:
+            True daca exista un prefetch pentru folder
+        """
+        with self._lock:
+            entry = self._entries.pop(folder_name, None)
+            if entry is None:
+                return False
+            self._cancel_entry(folder_name, entry)
+
+        print(f"[PREFETCH] Prefetch anulat pentru: {folder_name}")
+        return True
+
+    def _cancel_entry(self, folder_name: str, entry: Dict[str, Any]) -> None:
+        """Marcheaza intrarea ca anulata si curata cache-ul de pe disc (apelat sub lock)"""
+        entry["cancelled"] = True
+        entry["future"].cancel()
+        self.stats["cancelled"] += 1
+
+        # Daca preprocesarea ruleaza, thread-ul va sterge fisierul la final
+        if entry["future"].done():
+            try:
+                entry["cache_path"].unlink(missing_ok=True)
+            except Exception as e:
+                print(f"[PREFETCH WARNING] Nu s-a putut sterge cache-ul pentru {folder_name}: {e}")
+
+    def _evict_completed(self) -> None:
+        """Pastreaza in memorie cel mult max_entries rezultate complete (apelat sub lock)"""
+        completed = [name for name, entry in self._entries.items() if entry["future"].done()]
+        while len(completed) > self.max_entries:
+            name = completed.pop(0)
+            self._entries.pop(name, None)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Returneaza starea prefetch-urilor"""
+        with self._lock:
+            folders = {
+                name: ("done" if entry["future"].done() else "running" if entry["future"].running() else "pending")
+                for name, entry in self._entries.items()
+            }
+
+        return {
+            "max_workers": self.max_workers,
+            "max_entries": self.max_entries,
+            "folders": folders,
+            "stats": dict(self.stats)
+        }
+
+    def shutdown(self) -> None:
+        """Opreste executorul si anuleaza prefetch-urile in asteptare"""
+        with self._lock:
+            for name, entry in list(self._entries.items()):
+                if not entry["future"].done():
+                    self._cancel_entry(name, entry)
+            self._entries.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instanta globala
+_prefetcher = None
+
+
+def get_prefetcher() -> PreprocessPrefetcher:
+    """Returneaza instanta globala a prefetcher-ului"""
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = PreprocessPrefetcher()
+    return _prefetcher
+
+
+def shutdown_prefetcher() -> None:
+    """Opreste prefetcher-ul global (la inchiderea aplicatiei)"""
+    global _prefetcher
+    if _prefetcher is not None:
+        _prefetcher.shutdown()
+        _prefetcher = None
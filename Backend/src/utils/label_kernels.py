@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Kernel-uri compilate cu numba pentru postprocesarea volumelor de etichete
+Cu fallback NumPy pur daca numba nu este instalat
+"""
+import os
+
+import numpy as np
+
+from src.core.config import NUMBA_CACHE_DIR
+
+# numba citeste directorul de cache la import
+os.environ.setdefault("NUMBA_CACHE_DIR", str(NUMBA_CACHE_DIR))
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# ========== FALLBACK NUMPY ==========
+
+def _argmax_to_uint8_numpy(logits: np.ndarray) -> np.ndarray:
+    return np.argmax(logits, axis=0).astype(np.uint8)
+
+
+def _count_labels_numpy(labels: np.ndarray, num_labels: int) -> np.ndarray:
+    return np.bincount(labels.ravel(), minlength=num_labels).astype(np.int64)
+
+
+def _remap_labels_numpy(labels: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    return lut[labels]
+
+
+# ========== KERNEL-URI NUMBA ==========
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _argmax_to_uint8_numba(logits_flat):
+        num_classes, num_voxels = logits_flat.shape
+        out = np.empty(num_voxels, dtype=np.uint8)
+        for i in prange(num_voxels):
+            best_class = 0
+            best_value = logits_flat[0, i]
+            for c in range(1, num_classes):
+                value = logits_flat[c, i]
+                if value > best_value:
+                    best_value = value
+                    best_class = c
+            out[i] = best_class
+        return out
+
+    @njit(cache=True)
+    def _count_labels_numba(labels_flat, num_labels):
+        max_label = num_labels - 1
+        for i in range(labels_flat.shape[0]):
+            if labels_flat[i] > max_label:
+                max_label = labels_flat[i]
+        counts = np.zeros(max_label + 1, dtype=np.int64)
+        for i in range(labels_flat.shape[0]):
+            counts[labels_flat[i]] += 1
+        return counts
+
+    @njit(cache=True, parallel=True)
+    def _remap_labels_numba(labels_flat, lut):
+        out = np.empty(labels_flat.shape[0], dtype=lut.dtype)
+        for i in prange(labels_flat.shape[0]):
+            out[i] = lut[labels_flat[i]]
+        return out
+
+
+# ========== API PUBLIC ==========
+
+def argmax_to_uint8(logits: np.ndarray) -> np.ndarray:
+    """
+    Argmax pe axa claselor direct in uint8, intr-o singura trecere
+
+    Args:
+        logits: Array (C, H, W, D) cu scorurile/probabilitatile per clasa
+
+    Returns:
+        Array uint8 (H, W, D) cu clasa castigatoare (prima in caz de egalitate)
+    """
+    if not NUMBA_AVAILABLE:
+        return _argmax_to_uint8_numpy(logits)
+
+    logits = np.ascontiguousarray(logits)
+    flat = _argmax_to_uint8_numba(logits.reshape(logits.shape[0], -1))
+    return flat.reshape(logits.shape[1:])
+
+
+def count_labels(labels: np.ndarray, num_labels: int = 0) -> np.ndarray:
+    """
+    Numara voxelii fiecarei etichete intr-o singura trecere (inlocuieste np.unique cu return_counts)
+
+    Args:
+        labels: Volum de etichete intregi nenegative
+        num_labels: Lungimea minima a rezultatului
+
+    Returns:
+        Array int64 cu numarul de voxeli pentru fiecare eticheta (index = eticheta)
+    """
+    if not NUMBA_AVAILABLE:
+        return _count_labels_numpy(labels, num_labels)
+
+    return _count_labels_numba(np.ascontiguousarray(labels).ravel(), max(num_labels, 1))
+
+
+def remap_labels(labels: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    """
+    Remapeaza etichetele printr-un lookup table: rezultat[i] = lut[labels[i]]
+
+    Args:
+        labels: Volum de etichete intregi nenegative (< len(lut))
+        lut: Tabelul de remapare
+
+    Returns:
+        Volum cu aceeasi forma ca labels si dtype-ul lut
+    """
+    if not NUMBA_AVAILABLE:
+        return _remap_labels_numpy(labels, lut)
+
+    labels = np.ascontiguousarray(labels)
+    return _remap_labels_numba(labels.ravel(), np.ascontiguousarray(lut)).reshape(labels.shape)
@@ -0,0 +1,212 @@
+from unittest import TestCase
+import numpy as np
+from scipy.ndimage import binary_fill_holes, binary_opening, label
+
+
+def make_noisy_segmentation(size=48, noise=0.01, seed=0):
+    """Synthetic segmentation: one sphere per class plus scattered noise voxels"""
+    rng = np.random.default_rng(seed)
+    grid = np.indices((size, size, size))
+    segmentation = np.zeros((size, size, size), dtype=np.int64)
+
+    for class_id in range(1, 5):
+        center = rng.uniform(0.25, 0.75, size=3) * size
+        radius = rng.uniform(0.08, 0.2) * size
+        dist2 = sum((grid[axis] - center[axis]) ** 2 for axis in range(3))
+        segmentation[dist2 < radius ** 2] = class_id
+
+    noise_mask = rng.random(segmentation.shape) < noise
+    segmentation[noise_mask] = rng.integers(1, 5, size=int(noise_mask.sum()))
+    return segmentation
+
+
+class TestGliomaPostprocessor(TestCase):
+
+    def setUp(self):
+        """Setup before each test"""
+        print(f"\n{'=' * 60}")
+        print(f"🧩 STARTING POSTPROCESS TEST: {self._testMethodName}")
+        print(f"{'=' * 60}")
+
+        from src.services.postprocess import GliomaPostprocessor
+        self.processor = GliomaPostprocessor()
+        self.segmentation = make_noisy_segmentation()
+        print(f"✅ Synthetic segmentation: {self.segmentation.shape}")
+
+    def test_remove_small_components_matches_per_component_loop(self):
+        """Test bincount filtering against the per-component reference loop"""
+        print("📋 Testing remove_small_components equivalence...")
+
+        expected = self.segmentation.copy()
+        for class_id in range(1, 5):
+            labeled_array, num_components = label(expected == class_id)
+            for comp_id in range(1, num_components + 1):
+                component_mask = labeled_array == comp_id
+                if component_mask.sum() < self.processor.min_component_sizes[class_id]:
+                    expected[component_mask] = 0
+
+        result = self.processor.remove_small_components(self.segmentation)
+
+        print(f"✅ Voxels removed: {int((result != self.segmentation).sum())}")
+        np.testing.assert_array_equal(result, expected)
+        print("🎉 Bincount filtering is identical to the reference loop!")
+
+    def test_remove_small_components_keeps_input(self):
+        """Test that filtering does not modify the input array"""
+        print("📋 Testing input is left untouched...")
+
+        original = self.segmentation.copy()
+        self.processor.remove_small_components(self.segmentation)
+
+        np.testing.assert_array_equal(self.segmentation, original)
+        print("🎉 Input segmentation unchanged!")
+
+    def test_morphological_cleaning_matches_full_volume(self):
+        """Test bounding-box morphology against the full-volume reference"""
+        print("📋 Testing apply_morphological_cleaning is bit-identical...")
+
+        # Class 2 touches the volume border, class 3 is absent
+        segmentation = make_noisy_segmentation(seed=3)
+        segmentation[segmentation == 3] = 0
+        segmentation[:6, 10:30, 10:30] = 2
+
+        expected = segmentation.copy()
+        for class_id in range(1, 5):
+            class_mask = expected == class_id
+            if not class_mask.any():
+                continue
+            iterations = 1 if class_id in [1, 3, 4] else 2
+            filled_mask = binary_fill_holes(binary_opening(class_mask, iterations=iterations))
+            expected[class_mask] = 0
+            expected[filled_mask] = class_id
+
+        result = self.processor.apply_morphological_cleaning(segmentation)
+
+        print(f"✅ Voxels changed: {int((result != segmentation).sum())}")
+        np.testing.assert_array_equal(result, expected)
+        print("🎉 Bounding-box morphology is bit-identical!")
+
+    def test_class_bounding_boxes_are_clipped(self):
+        """Test bounding boxes with margins stay inside the volume"""
+        print("📋 Testing class bounding boxes...")
+
+        segmentation = np.zeros((20, 20, 20), dtype=np.uint8)
+        segmentation[0:3, 5:8, 17:20] = 1
+        segmentation[10, 10, 10] = 4
+
+        boxes = self.processor.get_class_bounding_boxes(segmentation, {1: 2, 4: 1})
+
+        print(f"✅ Boxes: {boxes}")
+        self.assertEqual(set(boxes), {1, 4})
+        self.assertEqual(boxes[1], (slice(0, 5), slice(3, 10), slice(15, 20)))
+        self.assertEqual(boxes[4], (slice(9, 12), slice(9, 12), slice(9, 12)))
+        print("🎉 Bounding boxes computed correctly!")
+
+    def test_parallel_remove_small_components_is_identical(self):
+        """Test that the thread-pool mode gives the sequential result"""
+        print("📋 Testing parallel remove_small_components...")
+
+        from src.services.postprocess import GliomaPostprocessor
+        parallel_processor = GliomaPostprocessor(num_workers=4)
+
+        np.testing.assert_array_equal(
+            parallel_processor.remove_small_components(self.segmentation),
+            self.processor.remove_small_components(self.segmentation)
+        )
+        print("🎉 Parallel filtering matches sequential!")
+
+    def test_parallel_morphological_cleaning_merge_order(self):
+        """Test parallel morphology on separated classes and its class priority"""
+        print("📋 Testing parallel apply_morphological_cleaning...")
+
+        from src.services.postprocess import GliomaPostprocessor
+        parallel_processor = GliomaPostprocessor(num_workers=4)
+
+        # Spatially separated classes: identical to the sequential mode
+        segmentation = np.zeros((40, 40, 40), dtype=np.int64)
+        segmentation[2:12, 2:12, 2:12] = 1
+        segmentation[20:34, 2:16, 2:16] = 2
+        segmentation[2:10, 25:35, 25:35] = 3
+        segmentation[25:35, 25:35, 25:35] = 4
+        segmentation[27:30, 27:30, 27:30] = 0  # interior hole
+
+        np.testing.assert_array_equal(
+            parallel_processor.apply_morphological_cleaning(segmentation),
+            self.processor.apply_morphological_cleaning(segmentation)
+        )
+
+        # Class 4 is nested inside class 1: class 1 fill-holes covers it,
+        # but class 4 is merged last and keeps its voxels
+        nested = np.zeros((30, 30, 30), dtype=np.int64)
+        nested[5:25, 5:25, 5:25] = 1
+        nested[12:18, 12:18, 12:18] = 4
+        result = parallel_processor.apply_morphological_cleaning(nested)
+
+        expected_class_4 = binary_fill_holes(binary_opening(nested == 4))
+
+        print(f"✅ Class 4 voxels kept: {int((result == 4).sum())}")
+        np.testing.assert_array_equal(result == 4, expected_class_4)
+        self.assertTrue((result[6:24, 6:24, 6:24] > 0).all())
+        print("🎉 Parallel morphology merges in class-priority order!")
+
+    def tearDown(self):
+        """Clean up after each test"""
+        print(f"\n🧹 CLEANUP: {self._testMethodName}")
+        print("✅ Postprocess test cleanup completed")
+        print(f"🏁 FINISHED: {self._testMethodName}")
+        print(f"{'=' * 60}\n")
+
+
+class TestLabelKernels(TestCase):
+
+    def setUp(self):
+        """Setup before each test"""
+        print(f"\n{'=' * 60}")
+        print(f"🧮 STARTING KERNEL TEST: {self._testMethodName}")
+        print(f"{'=' * 60}")
+
+        import src.utils.label_kernels as kernels
+        self.kernels = kernels
+        print(f"✅ Numba available: {kernels.NUMBA_AVAILABLE}")
+
+    def test_argmax_to_uint8_matches_numpy(self):
+        """Test the argmax kernel against the NumPy fallback and torch softmax+argmax"""
+        print("📋 Testing argmax_to_uint8...")
+
+        import torch
+
+        rng = np.random.default_rng(0)
+        logits = rng.standard_normal((5, 16, 12, 10)).astype(np.float32)
+        logits[:, 0, 0, 0] = 1.0  # tie -> first class
+
+        result = self.kernels.argmax_to_uint8(logits)
+        expected = torch.argmax(torch.softmax(torch.from_numpy(logits), dim=0), dim=0).numpy()
+
+        self.assertEqual(result.dtype, np.uint8)
+        self.assertEqual(result.shape, (16, 12, 10))
+        np.testing.assert_array_equal(result, expected)
+        np.testing.assert_array_equal(result, self.kernels._argmax_to_uint8_numpy(logits))
+        print("🎉 Argmax kernel matches softmax + argmax!")
+
+    def test_count_and_remap_labels(self):
+        """Test label counting and LUT remapping against NumPy"""
+        print("📋 Testing count_labels and remap_labels...")
+
+        labels = make_noisy_segmentation(size=24).astype(np.uint8)
+        unique, counts = np.unique(labels, return_counts=True)
+
+        result = self.kernels.count_labels(labels, 5)
+        self.assertEqual(len(result), 5)
+        np.testing.assert_array_equal(result[unique], counts)
+        np.testing.assert_array_equal(result, self.kernels._count_labels_numpy(labels, 5))
+
+        lut = np.array([0, 4, 3, 2, 1], dtype=np.uint8)
+        np.testing.assert_array_equal(self.kernels.remap_labels(labels, lut), lut[labels])
+        print("🎉 Counting and remapping match NumPy!")
+
+    def tearDown(self):
+        """Clean up after each test"""
+        print(f"\n🧹 CLEANUP: {self._testMethodName}")
+        print("✅ Kernel test cleanup completed")
+        print(f"🏁 FINISHED: {self._testMethodName}")
+        print(f"{'=' * 60}\n")
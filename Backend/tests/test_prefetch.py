@@ -0,0 +1,114 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import tempfile
+import threading
+
+
+class TestPreprocessPrefetcher(TestCase):
+
+    def setUp(self):
+        """Setup before each test"""
+        print(f"\n{'=' * 60}")
+        print(f"⚡ STARTING PREFETCH TEST: {self._testMethodName}")
+        print(f"{'=' * 60}")
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder_path = Path(self.temp_dir.name) / "patient_001"
+        self.folder_path.mkdir()
+        for modality in ["t1n", "t1c", "t2w", "t2f"]:
+            (self.folder_path / f"patient_001_{modality}.nii.gz").write_bytes(b"fake")
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        print("✅ Created fake patient folder with 4 modalities")
+
+    def _make_preprocessor(self, started=None, release=None):
+        mock_preprocessor = MagicMock()
+
+        def preprocess_folder(folder_path):
+            if started is not None:
+                started.set()
+            if release is not None:
+                release.wait(5)
+            return {"folder_name": folder_path.name, "image_tensor": "tensor"}
+
+        def save_preprocessed_data(data, output_path):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(b"pt")
+            return output_path
+
+        mock_preprocessor.preprocess_folder.side_effect = preprocess_folder
+        mock_preprocessor.save_preprocessed_data.side_effect = save_preprocessed_data
+        return mock_preprocessor
+
+    @patch('src.services.prefetch.get_preprocessor')
+    def test_schedule_and_take(self, mock_get_preprocessor):
+        """Test that a scheduled prefetch is consumed by the inference path"""
+        print("📋 Testing schedule -> take...")
+
+        from src.services.prefetch import PreprocessPrefetcher
+
+        mock_get_preprocessor.return_value = self._make_preprocessor()
+        prefetcher = PreprocessPrefetcher(cache_dir=self.cache_dir)
+
+        self.assertTrue(prefetcher.schedule(self.folder_path))
+        data = prefetcher.take(self.folder_path)
+
+        print(f"✅ Prefetched data: {data}")
+        self.assertEqual(data["folder_name"], "patient_001")
+        self.assertTrue((self.cache_dir / "patient_001_preprocessed.pt").exists())
+
+        # A doua cerere nu mai gaseste nimic (rezultatul a fost consumat)
+        self.assertIsNone(prefetcher.take(self.folder_path))
+        self.assertEqual(prefetcher.stats["hits"], 1)
+        prefetcher.shutdown()
+        print("🎉 Prefetch consumed correctly!")
+
+    @patch('src.services.prefetch.get_preprocessor')
+    def test_take_ignores_modified_folder(self, mock_get_preprocessor):
+        """Test that a prefetch is discarded when the folder changed"""
+        print("📋 Testing stale prefetch detection...")
+
+        from src.services.prefetch import PreprocessPrefetcher
+
+        mock_get_preprocessor.return_value = self._make_preprocessor()
+        prefetcher = PreprocessPrefetcher(cache_dir=self.cache_dir)
+
+        prefetcher.schedule(self.folder_path)
+        (self.folder_path / "patient_001_t1n.nii.gz").write_bytes(b"different content")
+
+        self.assertIsNone(prefetcher.take(self.folder_path))
+        prefetcher.shutdown()
+        print("🎉 Stale prefetch ignored!")
+
+    @patch('src.services.prefetch.get_preprocessor')
+    def test_cancel_running_prefetch(self, mock_get_preprocessor):
+        """Test cancelling a prefetch while preprocessing is still running"""
+        print("📋 Testing cancel on folder delete...")
+
+        from src.services.prefetch import PreprocessPrefetcher
+
+        started = threading.Event()
+        release = threading.Event()
+        mock_get_preprocessor.return_value = self._make_preprocessor(started, release)
+        prefetcher = PreprocessPrefetcher(cache_dir=self.cache_dir)
+
+        prefetcher.schedule(self.folder_path)
+        self.assertTrue(started.wait(5))
+
+        print("🔄 Cancelling while running...")
+        self.assertTrue(prefetcher.cancel("patient_001"))
+        release.set()
+        prefetcher._executor.shutdown(wait=True)
+
+        self.assertIsNone(prefetcher.take(self.folder_path))
+        self.assertFalse((self.cache_dir / "patient_001_preprocessed.pt").exists())
+        self.assertFalse(prefetcher.cancel("patient_001"))
+        print("🎉 Cancelled prefetch left no cache behind!")
+
+    def tearDown(self):
+        """Clean up after each test"""
+        print(f"\n🧹 CLEANUP: {self._testMethodName}")
+        self.temp_dir.cleanup()
+        print("✅ Prefetch test cleanup completed")
+        print(f"🏁 FINISHED: {self._testMethodName}")
+        print(f"{'=' * 60}\n")